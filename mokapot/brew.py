@@ -5,7 +5,6 @@ Defines a function to run the Percolator algorithm.
 from __future__ import annotations
 
 import logging
-import copy
 from operator import itemgetter
 
 import numpy as np
@@ -80,7 +79,7 @@ def brew(
         The number of cross-validation folds to use. PSMs originating
         from the same mass spectrum are always in the same fold.
     max_workers : int, optional
-        The number of processes to use for model training. More workers
+        The number of threads to use for model training. More workers
         will require more memory, but will typically decrease the total
         run time. An integer exceeding the number of folds will have
         no additional effect. Note that logging messages will be garbled
@@ -183,10 +182,13 @@ def brew(
             max_workers=max_workers,
         )
         del train_sets
+        # The folds are trained in threads, which share the training sets
+        # with this process instead of serializing them to workers:
         fitted = Parallel(n_jobs=max_workers, require="sharedmem")(
-            delayed(_fit_model)(d, psms, copy.deepcopy(model), f)
+            delayed(_fit_model)(d, psms, model._clone_unfitted(), f)
             for f, d in enumerate(train_psms)
         )
+        del train_psms
 
     # Sort models to have deterministic results with multithreading.
     fitted.sort(key=lambda x: x[0].fold)
@@ -221,23 +223,15 @@ def brew(
                 for _psms in psms
             ]
         else:
-            # generate model index for each psm in all folds
-            model_to_psm_idx = [
-                [[i] * len(idx) for i, idx in enumerate(test_fold_idx)]
-                for test_fold_idx in test_folds_idx
-            ]
-            # sort test indices and model indices in the original order
-            # (order of input data)
-            original_order_idx = [
-                np.argsort(utils.flatten(test_fold_idx)).tolist()
-                for test_fold_idx in test_folds_idx
-            ]
+            # generate model index for each psm in all folds, in the
+            # original order of the input data
+            model_to_psm_idx = []
+            for test_fold_idx, size in zip(test_folds_idx, data_size):
+                model_idx = np.empty(size, dtype=np.int64)
+                for i, idx in enumerate(test_fold_idx):
+                    model_idx[idx] = i
+                model_to_psm_idx.append(model_idx)
             del test_folds_idx
-            model_to_psm_idx = [
-                np.concatenate(model_idx)[idx]
-                for model_idx, idx in zip(model_to_psm_idx, original_order_idx)
-            ]
-            del original_order_idx
             scores = list(
                 _predict(
                     models_idx=model_to_psm_idx,
@@ -318,8 +312,8 @@ def make_train_sets(test_idx, subset_max_train, data_size, rng):
 
     Yields
     ------
-    PsmDataset
-        The training set.
+    list of numpy.ndarray
+        The sorted indices of the training set for each file.
     """
     subset_max_train_per_file = []
     if subset_max_train is not None:
@@ -329,19 +323,15 @@ def make_train_sets(test_idx, subset_max_train, data_size, rng):
         subset_max_train_per_file[-1] += subset_max_train - sum(
             subset_max_train_per_file
         )
-    chunk_range = 5000000
     for fold_idx in zip(*test_idx):
-        train_idx = [[] for _ in data_size]
+        train_idx = [None] * len(data_size)
         train_idx_size = 0
         for file_idx, idx in enumerate(fold_idx):
-            ds = data_size[file_idx]
-            k = 0
-            while k + chunk_range < ds:
-                train_idx[file_idx] += list(
-                    set(range(k, k + chunk_range)) - set(idx)
-                )
-                k += chunk_range
-            train_idx[file_idx] += list(set(range(k, ds)) - set(idx))
+            # Flip the test rows off in a boolean mask, which yields the
+            # training rows as a sorted index array:
+            train_mask = np.ones(data_size[file_idx], dtype=bool)
+            train_mask[idx] = False
+            train_idx[file_idx] = train_mask.nonzero()[0]
             train_idx_size += len(train_idx[file_idx])
         if len(subset_max_train_per_file) > 0 and train_idx_size > sum(
             subset_max_train_per_file
@@ -355,8 +345,12 @@ def make_train_sets(test_idx, subset_max_train, data_size, rng):
                 subset_max_train_per_file
             ):
                 if current_subset_max_train < train_idx_size:
-                    train_idx[i] = rng.choice(
-                        train_idx[i], current_subset_max_train, replace=False
+                    train_idx[i] = np.sort(
+                        rng.choice(
+                            train_idx[i],
+                            current_subset_max_train,
+                            replace=False,
+                        )
                     )
         yield train_idx
 
@@ -381,12 +375,6 @@ def _create_psms(psms, data, enforce_checks=True):
     )
 
 
-def get_index_values(df, col_name, val, orig_idx):
-    df = df[df[col_name] == val].drop(col_name, axis=1)
-    orig_idx[val] += list(df.index)
-    return df
-
-
 def predict_fold(model, fold, psms, scores):
     scores[fold].append(model.predict(psms))
 
@@ -418,27 +406,22 @@ def _predict(models_idx, psms, models, test_fdr, max_workers):
         n_folds = len(models)
         fold_scores = [[] for _ in range(n_folds)]
         targets = [[] for _ in range(n_folds)]
-        orig_idx = [[] for _ in range(n_folds)]
         file_iterator = _psms.read_data(
             columns=_psms.columns, chunk_size=CHUNK_SIZE_ROWS_PREDICTION
         )
         model_test_idx = utils.create_chunks(
             data=mod_idx, chunk_size=CHUNK_SIZE_ROWS_PREDICTION
         )
-        for i, psms_slice in enumerate(file_iterator):
-            psms_slice["fold"] = model_test_idx.pop(0)
-            psms_slice = [
-                get_index_values(psms_slice, "fold", i, orig_idx)
-                for i in range(n_folds)
-            ]
-            psms_slice = [
-                _create_psms(_psms, psm_slice, enforce_checks=False)
-                for psm_slice in psms_slice
-            ]
-            [
-                targets[i].append(psm_slice.targets)
-                for i, psm_slice in enumerate(psms_slice)
-            ]
+        for psms_slice, fold_idx in zip(file_iterator, model_test_idx):
+            psms_slice = _create_psms(_psms, psms_slice, enforce_checks=False)
+            # Score each fold on a view of the slice, rather than creating
+            # a new dataset for every fold:
+            feature_matrix = psms_slice._feature_matrix
+            fold_psms = []
+            for fold in range(n_folds):
+                fold_mask = fold_idx == fold
+                fold_psms.append(psms_slice._view(fold_mask, feature_matrix))
+                targets[fold].append(fold_psms[fold].targets)
 
             Parallel(n_jobs=max_workers, require="sharedmem")(
                 delayed(predict_fold)(
@@ -447,9 +430,9 @@ def _predict(models_idx, psms, models, test_fdr, max_workers):
                     psms=_psms,
                     scores=fold_scores,
                 )
-                for mod_idx, _psms in enumerate(psms_slice)
+                for mod_idx, _psms in enumerate(fold_psms)
             )
-            del psms_slice
+            del psms_slice, feature_matrix, fold_psms
         del file_iterator
         del model_test_idx
         for mod in models:
@@ -472,8 +455,12 @@ def _predict(models_idx, psms, models, test_fdr, max_workers):
                 )
         del targets
         del fold_scores
-        orig_idx = np.argsort(sum(orig_idx, [])).tolist()
-        yield np.concatenate(scores)[orig_idx]
+        # The chunks are read in order, so the scores of each fold follow
+        # the order of its PSMs in the input data:
+        psm_scores = np.empty(len(mod_idx), dtype=float)
+        for fold, fold_score in enumerate(scores):
+            psm_scores[mod_idx == fold] = fold_score
+        yield psm_scores
 
 
 def _predict_with_ensemble(psms, models, max_workers):
@@ -510,8 +497,11 @@ def _fit_model(train_set, psms, model, fold):
 
     Parameters
     ----------
-    train_set : PsmDataset
-        A PsmDataset that specifies the training data
+    train_set : pandas.DataFrame
+        The training PSMs of this fold. It is shared with the calling
+        thread, not copied.
+    psms : list of OnDiskPsmDataset
+        The collections of PSMs the training data was read from.
     model : tuple of Model
         A Classifier to train.
     fold : int
@@ -23,7 +23,6 @@ import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
 
-from zlib import crc32
 import numpy as np
 import pandas as pd
 from typeguard import typechecked
@@ -89,7 +88,10 @@ class PsmDataset(ABC):
         rng,
     ):
         """Initialize an object"""
-        self._data = psms.copy(deep=copy_data).reset_index(drop=True)
+        # reset_index() would copy the data again, so the new index is
+        # assigned to the (possibly shallow) copy in place instead.
+        self._data = psms.copy(deep=copy_data)
+        self._data.index = pd.RangeIndex(len(self._data))
         self._proteins = None
         self.rng = rng
 
@@ -119,6 +121,40 @@ class PsmDataset(ABC):
         else:
             self._feature_columns = utils.tuplize(feature_columns)
 
+        self._columns = None
+        self._resolve_columns()
+
+    def _resolve_columns(self):
+        """
+        Resolve the positions of the feature and metadata columns.
+
+        The positions are cached and only resolved again when the columns
+        of :py:attr:`data` have changed.
+        """
+        columns = self._data.columns
+        if columns is self._columns:
+            return
+
+        feature_idx = columns.get_indexer(self._feature_columns)
+        if (feature_idx < 0).any():
+            missing_features = [
+                c
+                for c, idx in zip(self._feature_columns, feature_idx)
+                if idx < 0
+            ]
+            raise ValueError(
+                "The following specified columns were not found: "
+                f"{missing_features}"
+            )
+
+        feature_set = set(self._feature_columns)
+        self._metadata_columns = tuple(
+            c for c in columns if c not in feature_set
+        )
+        self._feature_idx = feature_idx
+        self._metadata_idx = columns.get_indexer(self._metadata_columns)
+        self._columns = columns
+
     @property
     def data(self):
         """The full collection of PSMs as a :py:class:`pandas.DataFrame`."""
@@ -128,22 +164,31 @@ class PsmDataset(ABC):
         """Return the number of PSMs"""
         return len(self._data.index)
 
-    @property
-    def _metadata_columns(self):
-        """A list of the metadata columns"""
-        return tuple(
-            c for c in self.data.columns if c not in self._feature_columns
-        )
-
     @property
     def metadata(self):
         """A :py:class:`pandas.DataFrame` of the metadata."""
-        return self.data.loc[:, self._metadata_columns]
+        self._resolve_columns()
+        return self._data.iloc[:, self._metadata_idx]
 
     @property
     def features(self):
         """A :py:class:`pandas.DataFrame` of the features."""
-        return self.data.loc[:, self._feature_columns]
+        self._resolve_columns()
+        return self._data.iloc[:, self._feature_idx]
+
+    @property
+    def _feature_matrix(self):
+        """
+        The features as a C-contiguous, single precision
+        :py:class:`numpy.ndarray`.
+
+        A new matrix is created on every access, so that it reflects any
+        changes made to :py:attr:`data`. Single precision halves the
+        memory and bandwidth needed to scan the matrix. Callers that need
+        the matrix repeatedly, such as model training, should create it
+        once and pass it along.
+        """
+        return np.ascontiguousarray(self.features.values, dtype=np.float32)
 
     @property
     def spectra(self):
@@ -151,7 +196,7 @@ class PsmDataset(ABC):
         A :py:class:`pandas.DataFrame` of the columns that uniquely
         identify a mass spectrum.
         """
-        return self.data.loc[:, self._spectrum_columns]
+        return self._data.loc[:, self._spectrum_columns]
 
     @property
     def columns(self):
@@ -196,33 +241,27 @@ class PsmDataset(ABC):
 
         self._proteins = proteins
 
-    def _targets_count_by_feature(self, desc, eval_fdr):
+    def _targets_count_by_feature(self, desc, eval_fdr, feature_matrix):
         """
-        iterate over features and count the number of positive examples
+        count the number of positive examples for each feature
 
         :param desc: bool
             Are high scores better for the best feature?
         :param eval_fdr: float
             The false discovery rate threshold to use.
-        :return: pd.Series
+        :param feature_matrix: np.ndarray
+            The features, as returned by `_feature_matrix`.
+        :return: np.ndarray
             The number of positive examples for each feature.
         """
-        return pd.Series(
-            [
-                (
-                    self._update_labels(
-                        self.data.loc[:, col],
-                        eval_fdr=eval_fdr,
-                        desc=desc,
-                    )
-                    == 1
-                ).sum()
-                for col in self._feature_columns
-            ],
-            index=self._feature_columns,
+        return qvalues.tdc_count_passing(
+            feature_matrix,
+            target=self.targets,
+            eval_fdr=eval_fdr,
+            desc=desc,
         )
 
-    def _find_best_feature(self, eval_fdr):
+    def _find_best_feature(self, eval_fdr, feature_matrix=None):
         """
         Find the best feature to separate targets from decoys at the
         specified false-discovery rate threshold.
@@ -232,6 +271,9 @@ class PsmDataset(ABC):
         eval_fdr : float
             The false-discovery rate threshold used to define the
             best feature.
+        feature_matrix : numpy.ndarray, optional
+            The features, as returned by :py:attr:`_feature_matrix`. They
+            are created from :py:attr:`data` if not given.
 
         Returns
         -------
@@ -246,27 +288,37 @@ class PsmDataset(ABC):
         desc : bool
             Are high scores better for the best feature?
         """
-        best_feat = None
+        if feature_matrix is None:
+            feature_matrix = self._feature_matrix
+
+        best_idx = None
         best_positives = 0
-        new_labels = None
         for desc in (True, False):
-            num_passing = self._targets_count_by_feature(desc, eval_fdr)
-            feat_idx = num_passing.idxmax()
+            num_passing = self._targets_count_by_feature(
+                desc, eval_fdr, feature_matrix
+            )
+            feat_idx = num_passing.argmax()
             num_passing = num_passing[feat_idx]
 
             if num_passing > best_positives:
                 best_positives = num_passing
-                best_feat = feat_idx
-                new_labels = self._update_labels(
-                    self.data.loc[:, feat_idx], eval_fdr=eval_fdr, desc=desc
-                )
+                best_idx = feat_idx
                 best_desc = desc
 
-        if best_feat is None:
+        if best_idx is None:
             raise RuntimeError(
                 f"No PSMs found below the 'eval_fdr' {eval_fdr}."
             )
 
+        # Only the q-values of the best feature are needed for the labels:
+        targets = self.targets
+        qvals = qvalues.tdc(
+            feature_matrix[:, best_idx], target=targets, desc=best_desc
+        )
+        new_labels = np.where(targets, 1, -1).astype(np.int8)
+        new_labels[(qvals > eval_fdr) & targets] = 0
+        best_feat = self._feature_columns[best_idx]
+
         return best_feat, best_positives, new_labels, best_desc
 
     def _calibrate_scores(self, scores, eval_fdr, desc=True):
@@ -274,6 +326,57 @@ class PsmDataset(ABC):
             scores=scores, eval_fdr=eval_fdr, desc=desc, targets=self.targets
         )
 
+    def _view(self, mask, feature_matrix=None):
+        """
+        Get a lightweight view of a subset of the PSMs.
+
+        Parameters
+        ----------
+        mask : numpy.ndarray of bool
+            The PSMs to include in the view.
+        feature_matrix : numpy.ndarray, optional
+            The features, as returned by :py:attr:`_feature_matrix`. They
+            are created from :py:attr:`data` if not given.
+
+        Returns
+        -------
+        _FoldView
+            The features and targets of the selected PSMs.
+        """
+        if feature_matrix is None:
+            feature_matrix = self._feature_matrix
+
+        return _FoldView(
+            feature_columns=self._feature_columns,
+            feature_matrix=feature_matrix[mask],
+            targets=self.targets[mask],
+        )
+
+
+class _FoldView:
+    """
+    A subset of the PSMs in a PsmDataset, such as a cross-validation fold.
+
+    Only the features and targets are kept, which is all that is needed to
+    score the PSMs with a trained :py:class:`~mokapot.model.Model`. This
+    avoids creating a new :py:class:`pandas.DataFrame` and PsmDataset for
+    every subset.
+
+    :meta private:
+    """
+
+    __slots__ = ("_feature_columns", "_feature_matrix", "targets")
+
+    def __init__(self, feature_columns, feature_matrix, targets):
+        """Initialize a _FoldView object"""
+        self._feature_columns = feature_columns
+        self._feature_matrix = feature_matrix
+        self.targets = targets
+
+    def __len__(self):
+        """Return the number of PSMs"""
+        return len(self.targets)
+
 
 class LinearPsmDataset(PsmDataset):
     """Store and analyze a collection of PSMs.
@@ -410,7 +513,7 @@ class LinearPsmDataset(PsmDataset):
         num_targets = (self.targets).sum()
         num_decoys = (~self.targets).sum()
 
-        if not self.data.shape[0]:
+        if not self._data.shape[0]:
             raise ValueError("No PSMs were detected.")
         elif enforce_checks:
             if not num_targets:
@@ -421,7 +524,7 @@ class LinearPsmDataset(PsmDataset):
     def __repr__(self):
         """How to print the class"""
         return (
-            f"A mokapot.dataset.LinearPsmDataset with {len(self.data)} "
+            f"A mokapot.dataset.LinearPsmDataset with {len(self._data)} "
             "PSMs:\n"
             f"\t- Protein confidence estimates enabled: {self.has_proteins}\n"
             f"\t- Target PSMs: {self.targets.sum()}\n"
@@ -436,12 +539,12 @@ class LinearPsmDataset(PsmDataset):
         """A :py:class:`numpy.ndarray` indicating whether each PSM is a target
         sequence.
         """
-        return self.data[self._target_column].values
+        return self._data[self._target_column].values
 
     @property
     def peptides(self):
         """A :py:class:`pandas.Series` of the peptide column."""
-        return self.data.loc[:, self._peptide_column]
+        return self._data.loc[:, self._peptide_column]
 
     def _update_labels(self, scores, eval_fdr=0.01, desc=True):
         return _update_labels(
@@ -646,19 +749,17 @@ class OnDiskPsmDataset:
 
         Returns
         -------
-        A tuple of tuples of ints
-            Each of the returned tuples contains the indices  of PSMs in a
+        list of numpy.ndarray
+            Each of the returned arrays contains the indices of PSMs in a
             split.
         """
-        spectra = self.spectra_dataframe[self.spectrum_columns].values
+        # Hash the spectrum columns of each row in a vectorized manner, so
+        # that PSMs from the same spectrum land in the same split regardless
+        # of the row order:
+        spectra = pd.util.hash_pandas_object(
+            self.spectra_dataframe.loc[:, self.spectrum_columns], index=False
+        ).values
         del self.spectra_dataframe
-        spectra = np.apply_along_axis(
-            lambda x: crc32(
-                str((x[0], x[1])).encode()
-            ),  # fixme: why not just str(x) or str(tuple(x))
-            1,
-            spectra,
-        )
 
         # sort values to get start position of unique hashes
         spectra_idx = np.argsort(spectra)
@@ -733,7 +834,7 @@ def _update_labels(
 
     qvals = qvalues.tdc(scores, target=targets, desc=desc)
     unlabeled = np.logical_and(qvals > eval_fdr, targets)
-    new_labels = np.ones(len(qvals))
+    new_labels = np.ones(len(qvals), dtype=np.int8)
     new_labels[~targets] = -1
     new_labels[unlabeled] = 0
     return new_labels
@@ -14,14 +14,17 @@ want to emulate the behavior of Percolator.
 
 """
 
+import copy
 import logging
 import pickle
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from joblib import parallel_config
 from sklearn.base import clone
 from sklearn.svm import LinearSVC
+from sklearn.linear_model._base import LinearClassifierMixin
 from sklearn.model_selection import GridSearchCV, KFold
 from sklearn.model_selection._search import BaseSearchCV
 from sklearn.preprocessing import StandardScaler
@@ -155,6 +158,10 @@ class Model:
         # multiprocessing.
         self.fold = None
 
+        # The weights of a trained linear model, with the scaling of the
+        # features folded in. These are used as a shortcut for prediction.
+        self._linear_weights = None
+
         # Sort out whether we need to optimize hyperparameters:
         if isinstance(self.estimator, BaseSearchCV):
             self._needs_cv = True
@@ -207,6 +214,31 @@ class Model:
 
         return out_file
 
+    def _clone_unfitted(self):
+        """
+        Copy the model for training on a new cross-validation fold.
+
+        For an untrained model, the estimator and scaler are cloned with
+        :py:func:`sklearn.base.clone`, which only copies their
+        hyperparameters, and the remaining attributes are copied shallowly.
+        The random number generator is copied, so that each copy draws the
+        same random numbers as the original model would. Trained models are
+        deep copied to keep their fitted state.
+
+        Returns
+        -------
+        Model
+            The copy of the model.
+        """
+        if self.is_trained:
+            return copy.deepcopy(self)
+
+        new_model = copy.copy(self)
+        new_model.estimator = clone(self.estimator)
+        new_model.scaler = clone(self.scaler, safe=False)
+        new_model._rng = copy.deepcopy(self._rng)
+        return new_model
+
     def decision_function(self, psms):
         """
         Score a collection of PSMs
@@ -224,16 +256,24 @@ class Model:
         if not self.is_trained:
             raise NotFittedError("This model is untrained. Run fit() first.")
 
-        feat_names = psms.features.columns.tolist()
+        feat_names = list(psms._feature_columns)
         if set(feat_names) != set(self.features):
             raise ValueError(
                 "Features of the input data do not match the "
                 "features of this Model."
             )
 
-        feat = self.scaler.transform(
-            psms.features.loc[:, self.features].values
-        )
+        feat = psms._feature_matrix
+        if feat_names != self.features:
+            feat = feat[:, [feat_names.index(f) for f in self.features]]
+
+        # Models pickled by older versions lack the linear weights:
+        linear_weights = getattr(self, "_linear_weights", None)
+        if linear_weights is not None:
+            weights, intercept = linear_weights
+            return (feat @ weights + intercept).astype(np.float64)
+
+        feat = self.scaler.transform(feat)
 
         return _get_scores(self.estimator, feat)
 
@@ -268,24 +308,27 @@ class Model:
         if not (~psms.targets).sum():
             raise ValueError("No decoy PSMs were available for training.")
 
-        if len(psms.data) <= 200:
+        if len(psms) <= 200:
             LOGGER.warning(
                 "Few PSMs are available for model training (%i). "
                 "The learned models may be unstable.",
-                len(psms.data),
+                len(psms),
             )
 
+        # Gather the features once for the whole training run:
+        feat = psms._feature_matrix
+
         # Choose the initial direction
         (
             start_labels,
             self.feat_pass,
             self.best_feat,
             self.desc,
-        ) = _get_starting_labels(psms, self)
+        ) = _get_starting_labels(psms, self, feat)
 
         # Normalize Features
-        self.features = psms.features.columns.tolist()
-        norm_feat = self.scaler.fit_transform(psms.features.values)
+        self.features = list(psms._feature_columns)
+        norm_feat = self.scaler.fit_transform(feat)
 
         # Shuffle order
         shuffled_idx = self.rng.permutation(np.arange(len(start_labels)))
@@ -334,6 +377,7 @@ class Model:
                 raise RuntimeError("Model performs worse after training.")
 
         self.estimator = model
+        self._linear_weights = _get_linear_weights(model, self.scaler)
         weights = _get_weights(self.estimator, self.features)
         if weights is not None:
             LOGGER.debug("Normalized feature weights in the learned model:")
@@ -537,7 +581,7 @@ def load_model(model_file: Path):
 
 
 # Private Functions -----------------------------------------------------------
-def _get_starting_labels(psms, model):
+def _get_starting_labels(psms, model, feat):
     """
     Get labels using the initial direction.
 
@@ -547,6 +591,8 @@ def _get_starting_labels(psms, model):
         The PsmDataset object
     model : mokapot.Model
         A model object (this is likely `self`)
+    feat : numpy.ndarray
+        The features of the PSMs, as returned by `psms._feature_matrix`.
 
     Returns
     -------
@@ -557,7 +603,7 @@ def _get_starting_labels(psms, model):
     """
     LOGGER.debug("Finding initial direction...")
     if model.direction is None and not model.is_trained:
-        feat_res = psms._find_best_feature(model.train_fdr)
+        feat_res = psms._find_best_feature(model.train_fdr, feat)
         best_feat, feat_pass, start_labels, desc = feat_res
         LOGGER.info(
             "\t- Selected feature %s with %i PSMs at q<=%g.",
@@ -568,7 +614,7 @@ def _get_starting_labels(psms, model):
 
     elif model.is_trained:
         try:
-            scores = model.estimator.decision_function(psms.features.values)
+            scores = model.estimator.decision_function(feat)
         except AttributeError:
             scores = model.estimator.predict_proba(psms.features).flatten()
 
@@ -637,8 +683,15 @@ def _find_hyperparameters(model, features, labels):
         cv_samples = features[labels.astype(bool), :]
         cv_targ = (labels[labels.astype(bool)] + 1) / 2
 
-        # Fit the model
-        model.estimator.fit(cv_samples, cv_targ)
+        # Fit the model. The liblinear solver behind LinearSVC releases the
+        # GIL, so threads are preferred for its search: the training data
+        # is then shared rather than pickled to worker processes. This is
+        # only a hint, so a joblib backend configured by the user wins.
+        if isinstance(model.estimator.estimator, LinearSVC):
+            with parallel_config(prefer="threads"):
+                model.estimator.fit(cv_samples, cv_targ)
+        else:
+            model.estimator.fit(cv_samples, cv_targ)
 
         # Extract the best params.
         best_params = model.estimator.best_params_
@@ -689,6 +742,50 @@ def _get_weights(model, features):
     return txt_out
 
 
+def _get_linear_weights(model, scaler):
+    """
+    Get the weights of a linear model, with the feature scaling folded in.
+
+    For a linear classifier and a :py:class:`DummyScaler` or
+    :py:class:`~sklearn.preprocessing.StandardScaler`, the scores are an
+    affine function of the raw features. Folding the scaling into the
+    weights lets predictions skip the scaling and the input validation of
+    scikit-learn, and use a single float32 matrix-vector product.
+
+    Parameters
+    ----------
+    model : an estimator object
+        The trained model.
+    scaler : scaler object
+        The scaler that normalized the features for the model.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, float) or None
+        The float32 weights for each feature and the intercept, or None if
+        the scores of the model are not an affine function of the features.
+    """
+    if not isinstance(model, LinearClassifierMixin):
+        return None
+
+    weights = np.asarray(model.coef_, dtype=np.float64)
+    intercept = np.asarray(model.intercept_, dtype=np.float64)
+    if weights.shape[0] != 1 or intercept.shape != (1,):
+        return None
+
+    weights = weights[0]
+    intercept = intercept[0]
+    if isinstance(scaler, StandardScaler):
+        if scaler.with_std:
+            weights = weights / scaler.scale_
+        if scaler.with_mean:
+            intercept -= scaler.mean_ @ weights
+    elif not isinstance(scaler, DummyScaler):
+        return None
+
+    return weights.astype(np.float32), float(intercept)
+
+
 def _get_scores(model, feat):
     """Get the scores from a model
 
@@ -6,6 +6,7 @@ import logging
 import warnings
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from joblib import Parallel, delayed
 
@@ -276,7 +277,7 @@ def drop_missing_values_and_fill_spectra_dataframe(
     spectra: List,
     df_spectra_list: List[pd.DataFrame],
 ):
-    na_mask = pd.DataFrame([], columns=list(set(column) - set(spectra)))
+    na_mask = pd.Series(False, index=[c for c in column if c not in spectra])
     file_iterator = reader.get_chunked_data_iterator(
         chunk_size=CHUNK_SIZE_ROWS_FOR_DROP_COLUMNS, columns=column
     )
@@ -288,12 +289,8 @@ def drop_missing_values_and_fill_spectra_dataframe(
                     "ignore", category=pd.errors.SettingWithCopyWarning
                 )
                 feature.drop(spectra, axis=1, inplace=True)
-        na_mask = pd.concat(
-            [na_mask, pd.DataFrame([feature.isna().any(axis=0)])],
-            ignore_index=True,
-        )
+        na_mask |= feature.isna().any(axis=0)
     del file_iterator
-    na_mask = na_mask.any(axis=0)
     if na_mask.any():
         return list(na_mask[na_mask].index)
 
@@ -318,40 +315,39 @@ def get_column_names_from_file(file):
         return perc.readline().rstrip().split("\t")
 
 
-def get_rows_from_dataframe(idx, chunk, train_psms, psms, file_idx):
+def get_rows_from_dataframe(idx, chunk, psms):
     """
     extract rows from a chunk of a dataframe
 
     Parameters
     ----------
-    idx : list of list of indexes
-        The indexes to select from dataframe.
-    train_psms : list of list of dataframes
-        Contains subsets of dataframes that are already extracted.
+    idx : list of numpy.ndarray
+        The sorted indexes to select from dataframe, one array per fold.
     chunk : dataframe
         Subset of a dataframe.
     psms : OnDiskPsmDataset
         A collection of PSMs.
-    file_idx : the index of the file being searched
 
     Returns
     -------
     List
-        list of list of dataframes
+        list of dataframes, one for each fold
     """
     chunk = convert_targets_column(
         data=chunk,
         target_column=psms.target_column,
     )
-    for k, train in enumerate(idx):
-        idx_ = list(set(train) & set(chunk.index))
-        train_psms[file_idx][k].append(chunk.loc[idx_])
-
-
-def concat_and_reindex_chunks(df, orig_idx):
+    # Models are trained on single precision features, so there is no need
+    # to keep the training sets in double precision:
+    chunk = chunk.astype(dict.fromkeys(psms.feature_columns, np.float32))
+    # Chunks span a contiguous range of row indexes, so the training rows
+    # they contain can be located in the sorted indexes by bisection:
+    start, stop = chunk.index[0], chunk.index[-1] + 1
     return [
-        pd.concat(df_fold).reindex(orig_idx_fold)
-        for df_fold, orig_idx_fold in zip(df, orig_idx)
+        chunk.loc[
+            train[np.searchsorted(train, start) : np.searchsorted(train, stop)]
+        ]
+        for train in idx
     ]
 
 
@@ -363,9 +359,9 @@ def parse_in_chunks(psms, train_idx, chunk_size, max_workers):
     ----------
     psms : OnDiskPsmDataset
         A collection of PSMs.
-    train_idx : list of a list of a list of indexes (first level are training
+    train_idx : list of a list of a numpy.ndarray (first level are training
         splits, second one is the number of input files, third level the
-        actual idexes The indexes to select from data.
+        actual sorted indexes) The indexes to select from data.
     chunk_size : int
         The chunk size in bytes.
     max_workers: int
@@ -376,23 +372,20 @@ def parse_in_chunks(psms, train_idx, chunk_size, max_workers):
     List
         list of dataframes
     """
-
-    train_psms = [
-        [[] for _ in range(len(train_idx))] for _ in range(len(psms))
-    ]
-    for _psms, idx, file_idx in zip(psms, zip(*train_idx), range(len(psms))):
+    train_psms = [[] for _ in range(len(train_idx))]
+    for _psms, idx in zip(psms, zip(*train_idx)):
         reader = TabularDataReader.from_path(_psms.filename)
         file_iterator = reader.get_chunked_data_iterator(
             chunk_size=chunk_size, columns=_psms.columns
         )
-        Parallel(n_jobs=max_workers, require="sharedmem")(
-            delayed(get_rows_from_dataframe)(
-                idx, chunk, train_psms, _psms, file_idx
-            )
+        chunk_rows = Parallel(n_jobs=max_workers, require="sharedmem")(
+            delayed(get_rows_from_dataframe)(idx, chunk, _psms)
             for chunk in file_iterator
         )
-    train_psms_reordered = Parallel(n_jobs=max_workers, require="sharedmem")(
-        delayed(concat_and_reindex_chunks)(df=df, orig_idx=orig_idx)
-        for df, orig_idx in zip(train_psms, zip(*train_idx))
-    )
-    return [pd.concat(df) for df in zip(*train_psms_reordered)]
+        # The chunks are returned in file order, so the rows of each fold
+        # are already in the order of the training indexes:
+        for fold_psms, rows in zip(train_psms, zip(*chunk_rows)):
+            fold_psms.extend(rows)
+        del chunk_rows
+
+    return [pd.concat(fold_psms) for fold_psms in train_psms]
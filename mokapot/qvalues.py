@@ -106,90 +106,165 @@ def tdc(
     if np.issubdtype(scores.dtype, np.integer):
         scores = scores.astype(np.float32)
 
-    # Sort and estimate FDR
+    qvals = np.empty(len(scores), dtype=np.float64)
+    _tdc_one(scores, target, desc, qvals)
+    return qvals
+
+
+@typechecked
+def tdc_count_passing(
+    scores: np.ndarray[float],
+    target: np.ndarray[bool],
+    eval_fdr: float,
+    desc: bool = True,
+):
+    """
+    Count the targets accepted by TDC for each column of a score matrix.
+
+    This is equivalent to counting the targets with a q-value of at most
+    `eval_fdr` from :py:func:`tdc` on each column of `scores`, but all of
+    the columns are processed in a single compiled function and the
+    q-values of each column are discarded once counted, so that the full
+    q-value matrix is never stored.
+
+    Parameters
+    ----------
+    scores : numpy.ndarray of float
+        A 2D array, where each column contains a score to rank by.
+
+    target : numpy.ndarray of bool
+        A 1D array indicating if each row is from a target or decoy hit.
+        `target` must be the same length as the rows of `scores`.
+
+    eval_fdr : float
+        The false discovery rate threshold at which targets are accepted.
+
+    desc : bool
+        Are higher scores better? `True` indicates that they are,
+        `False` indicates that they are not.
+
+    Returns
+    -------
+    numpy.ndarray
+        A 1D array with the number of accepted targets for each column
+        of `scores`.
+    """
+    if scores.ndim != 2:
+        raise ValueError("'scores' must be a 2D array")
+
+    if scores.shape[0] != target.shape[0]:
+        raise ValueError("'scores' and 'target' must be the same length")
+
+    if not np.issubdtype(scores.dtype, np.floating):
+        scores = scores.astype(np.float64)
+
+    counts = np.empty(scores.shape[1], dtype=np.int64)
+    _tdc_count_passing(scores, target, desc, eval_fdr, counts)
+    return counts
+
+
+@nb.njit(nogil=True, cache=True)
+def _tdc_one(scores, target, desc, qvals):
+    """
+    Compute the TDC q-values for a vector of scores.
+
+    All PSMs sharing a score receive the FDR estimated after accepting
+    all of them. The GIL is released, so that the folds trained in
+    separate threads by :py:func:`~mokapot.brew` can run this
+    concurrently.
+
+    Parameters
+    ----------
+    scores : numpy.ndarray
+        A 1D array of scores.
+    target : numpy.ndarray
+        A 1D boolean array indicating targets.
+    desc : bool
+        Are higher scores better?
+    qvals : numpy.ndarray
+        The 1D array in which the q-values are stored.
+    """
+    num_psms = scores.shape[0]
     if desc:
         srt_idx = np.argsort(-scores)
     else:
         srt_idx = np.argsort(scores)
 
-    scores = scores[srt_idx]
-    target = target[srt_idx]
-    cum_targets = target.cumsum()
-    cum_decoys = ((target - 1) ** 2).cumsum()
-    num_total = cum_targets + cum_decoys
-
-    # Handles zeros in denominator
-    fdr = np.divide(
-        (cum_decoys + 1),
-        cum_targets,
-        out=np.ones_like(cum_targets, dtype=np.float32),
-        where=(cum_targets != 0),
-    )
+    # Estimate the FDR at the end of each group of tied scores:
+    fdr = np.ones(num_psms, dtype=np.float32)
+    num_targets = 0
+    num_decoys = 0
+    group_start = 0
+    for idx in range(num_psms):
+        if target[srt_idx[idx]]:
+            num_targets += 1
+        else:
+            num_decoys += 1
 
-    # Calculate q-values
-    unique_metric, indices = np.unique(scores, return_counts=True)
+        if (
+            idx + 1 < num_psms
+            and scores[srt_idx[idx + 1]] == scores[srt_idx[idx]]
+        ):
+            continue
 
-    # Some arrays need to be flipped so that we can loop through from
-    # worse to best score.
-    fdr = np.flip(fdr)
-    num_total = np.flip(num_total)
-    if not desc:
-        unique_metric = np.flip(unique_metric)
-        indices = np.flip(indices)
+        if num_targets:
+            fdr[group_start : idx + 1] = (num_decoys + 1) / num_targets
 
-    qvals = _fdr2qvalue(fdr, num_total, unique_metric, indices)
-    qvals = np.flip(qvals)
-    qvals = qvals[np.argsort(srt_idx)]
+        group_start = idx + 1
 
-    return qvals
+    # Calculate q-values, from the worst to the best score:
+    min_q = 1.0
+    for idx in range(num_psms - 1, -1, -1):
+        if fdr[idx] < min_q:
+            min_q = fdr[idx]
 
+        qvals[srt_idx[idx]] = min_q
 
-@nb.njit
-def _fdr2qvalue(fdr, num_total, met, indices):
+
+@nb.njit(nogil=True, cache=True)
+def _tdc_count_passing(scores, target, desc, eval_fdr, counts):
     """
-    Quickly turn a list of FDRs to q-values.
+    Count the targets accepted by TDC for each column of scores.
 
-    All of the inputs are assumed to be sorted.
+    Each column is copied into a scratch buffer and its q-values into
+    another, which are both reused for the next column.
 
     Parameters
     ----------
-    fdr : numpy.ndarray
-        A vector of all unique FDR values.
+    scores : numpy.ndarray
+        A 2D array of scores.
+    target : numpy.ndarray
+        A 1D boolean array indicating targets.
+    desc : bool
+        Are higher scores better?
+    eval_fdr : float
+        The false discovery rate threshold at which targets are accepted.
+    counts : numpy.ndarray
+        The 1D array in which the number of accepted targets is stored.
+    """
+    col_scores = np.empty(scores.shape[0], dtype=scores.dtype)
+    qvals = np.empty(scores.shape[0], dtype=np.float64)
+    for col in range(scores.shape[1]):
+        col_scores[:] = scores[:, col]
+        _tdc_one(col_scores, target, desc, qvals)
+        num_passing = 0
+        for idx in range(scores.shape[0]):
+            if target[idx] and qvals[idx] <= eval_fdr:
+                num_passing += 1
 
-    num_total : numpy.ndarray
-        A vector of the cumulative number of PSMs at each score.
+        counts[col] = num_passing
 
-    met : numpy.ndarray
-        A vector of the scores for each PSM.
 
-    indices : tuple of numpy.ndarray
-        Tuple where the vector at index i indicates the PSMs that
-        shared the unique FDR value in `fdr`.
+def _compile_tdc():
+    """Compile the TDC kernels for the common dtypes ahead of first use."""
+    target = np.array([True, False])
+    for dtype in (np.float32, np.float64):
+        scores = np.zeros((2, 1), dtype=dtype)
+        _tdc_one(scores[:, 0].copy(), target, True, np.empty(2))
+        _tdc_count_passing(scores, target, True, 0.01, np.empty(1, int))
 
-    Returns
-    -------
-    numpy.ndarray
-        A vector of q-values.
-    """
-    min_q = 1
-    qvals = np.ones(len(fdr))
-    group_fdr = np.ones(len(fdr))
-    prev_idx = 0
-    for idx in range(met.shape[0]):
-        next_idx = prev_idx + indices[idx]
-        group = slice(prev_idx, next_idx)
-        prev_idx = next_idx
-
-        fdr_group = fdr[group]
-        n_group = num_total[group]
-        curr_fdr = fdr_group[np.argmax(n_group)]
-        if curr_fdr < min_q:
-            min_q = curr_fdr
-
-        group_fdr[group] = curr_fdr
-        qvals[group] = min_q
 
-    return qvals
+_compile_tdc()
 
 
 def qvalues_from_scores(scores, targets, qvalue_algorithm="tdc"):
@@ -6,6 +6,7 @@ import pytest
 import numpy as np
 import mokapot
 from mokapot import PercolatorModel, Model
+from mokapot.brew import make_train_sets
 from sklearn.ensemble import RandomForestClassifier
 
 np.random.seed(42)
@@ -241,3 +242,15 @@ def test_brew_using_non_trained_models_error(psms_ondisk, svm):
 def assert_not_close(x, y):
     """Assert that two arrays are not equal"""
     np.testing.assert_raises(AssertionError, np.testing.assert_allclose, x, y)
+
+
+def test_make_train_sets():
+    """Test that the training sets are the complement of the test sets"""
+    test_idx = [[np.array([4, 0, 2]), np.array([1, 5]), np.array([3])]]
+    train_sets = list(
+        make_train_sets(test_idx, subset_max_train=None, data_size=[6], rng=0)
+    )
+    assert len(train_sets) == 3
+    np.testing.assert_array_equal(train_sets[0][0], [1, 3, 5])
+    np.testing.assert_array_equal(train_sets[1][0], [0, 2, 3, 4])
+    np.testing.assert_array_equal(train_sets[2][0], [0, 1, 2, 4, 5])
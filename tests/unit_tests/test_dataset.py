@@ -3,6 +3,7 @@ These tests verify that the dataset classes are functioning properly.
 """
 
 import numpy as np
+import pytest
 import pandas as pd
 from mokapot import LinearPsmDataset
 
@@ -34,6 +35,11 @@ def test_linear_init(psm_df_6):
     pd.testing.assert_frame_equal(dset.spectra, psm_df_6.loc[:, ["spectrum"]])
     pd.testing.assert_series_equal(dset.peptides, psm_df_6.loc[:, "peptide"])
     pd.testing.assert_frame_equal(dset.features, psm_df_6.loc[:, features])
+    np.testing.assert_array_equal(
+        dset._feature_matrix, psm_df_6.loc[:, features].values
+    )
+    assert dset._feature_matrix.flags["C_CONTIGUOUS"]
+    assert dset._feature_matrix.dtype == np.float32
     pd.testing.assert_frame_equal(dset.metadata, psm_df_6.loc[:, metadata])
     assert dset.columns == psm_df_6.columns.tolist()
     assert np.array_equal(dset.targets, psm_df_6["target"].values)
@@ -56,3 +62,144 @@ def test_update_labels(psm_df_6):
     real_labs = np.array([1, 1, 0, -1, -1, -1])
     new_labs = dset._update_labels(scores, eval_fdr=0.5)
     assert np.array_equal(real_labs, new_labs)
+
+
+def test_find_best_feature(psm_df_6):
+    """Test that the best feature and its labels are found"""
+    dset = LinearPsmDataset(
+        psm_df_6,
+        target_column="target",
+        spectrum_columns="spectrum",
+        peptide_column="peptide",
+        protein_column="protein",
+        feature_columns=None,
+        copy_data=True,
+    )
+
+    feat, num_passing, labels, desc = dset._find_best_feature(0.5)
+    assert feat == "feature_1"
+    assert num_passing == 2
+    assert desc
+    assert labels.dtype == np.int8
+    np.testing.assert_array_equal(labels, [1, 1, 0, -1, -1, -1])
+
+    with pytest.raises(RuntimeError):
+        dset._find_best_feature(0.01)
+
+
+def test_linear_init_no_copy(psm_df_6):
+    """Test that the data is not copied when copy_data is False"""
+    dat = psm_df_6.copy()
+    dat.index = dat.index[::-1]
+    dset = LinearPsmDataset(
+        psms=dat,
+        target_column="target",
+        spectrum_columns="spectrum",
+        peptide_column="peptide",
+        protein_column="protein",
+        feature_columns=None,
+        copy_data=False,
+    )
+
+    assert dset.data.index.tolist() == list(range(6))
+    assert dat.index.tolist() == list(range(6))[::-1]
+    assert np.shares_memory(
+        dset.data["feature_1"].values, dat["feature_1"].values
+    )
+
+
+def test_linear_init_missing_feature(psm_df_6):
+    """Test that missing feature columns raise an error"""
+    with pytest.raises(ValueError, match="blah"):
+        LinearPsmDataset(
+            psms=psm_df_6,
+            target_column="target",
+            spectrum_columns="spectrum",
+            peptide_column="peptide",
+            feature_columns=["feature_1", "blah"],
+        )
+
+
+def test_linear_columns_mutated(psm_df_6):
+    """Test that the features follow changes to the columns of the data"""
+    dat = psm_df_6.copy()
+    dat.insert(0, "extra", 1)
+    dset = LinearPsmDataset(
+        psms=dat,
+        target_column="target",
+        spectrum_columns="spectrum",
+        peptide_column="peptide",
+        protein_column="protein",
+        feature_columns=["feature_1", "feature_2"],
+    )
+
+    features = ["feature_1", "feature_2"]
+    metadata = ["target", "spectrum", "peptide", "protein"]
+    assert dset.metadata.columns.tolist() == ["extra"] + metadata
+
+    dset.data.drop(columns="extra", inplace=True)
+    pd.testing.assert_frame_equal(dset.features, psm_df_6.loc[:, features])
+    pd.testing.assert_frame_equal(dset.metadata, psm_df_6.loc[:, metadata])
+
+    dset.data.insert(0, "zz", 2)
+    pd.testing.assert_frame_equal(dset.features, psm_df_6.loc[:, features])
+    assert dset.metadata.columns.tolist() == ["zz"] + metadata
+
+
+def test_linear_feature_matrix_mutated(psm_df_6):
+    """Test that the feature matrix follows in place changes to the data"""
+    dset = LinearPsmDataset(
+        psms=psm_df_6,
+        target_column="target",
+        spectrum_columns="spectrum",
+        peptide_column="peptide",
+        protein_column="protein",
+    )
+
+    data = dset.data
+    np.testing.assert_array_equal(
+        dset._feature_matrix, psm_df_6.loc[:, ["feature_1", "feature_2"]]
+    )
+
+    data["feature_1"] = 0
+    np.testing.assert_array_equal(dset._feature_matrix[:, 0], 0)
+
+    data.drop(columns="feature_1", inplace=True)
+    with pytest.raises(ValueError, match="feature_1"):
+        dset._feature_matrix
+
+
+def test_view(psm_df_6):
+    """Test that a view contains the selected PSMs"""
+    dset = LinearPsmDataset(
+        psms=psm_df_6,
+        target_column="target",
+        spectrum_columns="spectrum",
+        peptide_column="peptide",
+        protein_column="protein",
+    )
+
+    mask = np.array([True, False, True, True, False, False])
+    view = dset._view(mask)
+    assert len(view) == 3
+    assert view._feature_columns == dset._feature_columns
+    np.testing.assert_array_equal(view.targets, [True, True, False])
+    np.testing.assert_array_equal(
+        view._feature_matrix, psm_df_6.loc[mask, ["feature_1", "feature_2"]]
+    )
+
+
+def test_ondisk_split(psms_ondisk):
+    """Test that PSMs from the same spectrum end up in the same fold"""
+    spectra = psms_ondisk.spectra_dataframe.copy()
+    folds = psms_ondisk._split(3, np.random.default_rng(42))
+    assert len(folds) == 3
+    all_idx = np.concatenate(folds)
+    np.testing.assert_array_equal(np.sort(all_idx), np.arange(len(spectra)))
+
+    fold_of_psm = np.empty(len(spectra), dtype=int)
+    for fold, idx in enumerate(folds):
+        fold_of_psm[idx] = fold
+    spectra["fold"] = fold_of_psm
+    n_folds = spectra.groupby(["ScanNr", "ExpMass"])["fold"].nunique()
+    assert (n_folds == 1).all()
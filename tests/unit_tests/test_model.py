@@ -39,6 +39,31 @@ def test_model_init():
     assert isinstance(model.scaler, StandardScaler)
 
 
+def test_model_clone_unfitted(psms):
+    """Test that untrained models are cloned for each fold"""
+    model = mokapot.PercolatorModel(rng=1)
+    clone = model._clone_unfitted()
+    assert isinstance(clone, mokapot.PercolatorModel)
+    assert clone.estimator is not model.estimator
+    assert clone.scaler is not model.scaler
+    assert clone.rng is not model.rng
+    assert clone.rng.random() == model.rng.random()
+
+    model = mokapot.Model(
+        LogisticRegression(), scaler="as-is", train_fdr=0.05, max_iter=1
+    )
+    clone = model._clone_unfitted()
+    assert isinstance(clone.scaler, mokapot.model.DummyScaler)
+    assert clone.scaler is not model.scaler
+
+    model.fit(psms)
+    clone = model._clone_unfitted()
+    assert clone.is_trained
+    np.testing.assert_array_equal(
+        clone.decision_function(psms), model.decision_function(psms)
+    )
+
+
 def test_perc_init():
     """Test the initialization of a PercolatorModel"""
     model = mokapot.PercolatorModel(
@@ -111,6 +136,42 @@ def test_model_predict(psms):
         model.predict(psms)
 
 
+def test_model_predict_after_edit(psms):
+    """Test that predictions follow edits made to the data after fitting"""
+    model = mokapot.PercolatorModel(train_fdr=0.05, max_iter=1)
+    data = psms.data
+    model.fit(psms)
+    before = model.predict(psms)
+
+    data["score"] = 0.0
+    after = model.predict(psms)
+    assert not np.allclose(before, after)
+
+
+def test_model_predict_linear_weights(psms):
+    """Test that predicting with the folded linear weights is equivalent"""
+    models = [
+        mokapot.PercolatorModel(train_fdr=0.05, max_iter=1),
+        mokapot.Model(
+            LogisticRegression(), scaler="as-is", train_fdr=0.05, max_iter=1
+        ),
+        mokapot.Model(
+            LogisticRegression(),
+            scaler=MinMaxScaler(),
+            train_fdr=0.05,
+            max_iter=1,
+        ),
+    ]
+    for model, is_affine in zip(models, [True, True, False]):
+        model.fit(psms)
+        assert (model._linear_weights is not None) == is_affine
+        scores = model.predict(psms)
+        model._linear_weights = None
+        np.testing.assert_allclose(
+            scores, model.predict(psms), rtol=1e-5, atol=1e-5
+        )
+
+
 def test_model_persistance(tmp_path):
     """test that we can save and load a model"""
     model_file = tmp_path / "model.pkl"
@@ -1,12 +1,16 @@
 """Test that parsing Percolator input files works correctly"""
 
+from io import StringIO
 from pathlib import Path
+from unittest import mock
 
+import numpy as np
 import pytest
 import pandas as pd
 
 import mokapot
-from mokapot.parsers import pin
+from mokapot.parsers import pin, pin_to_tsv
+from mokapot.tabular_data import TabularDataReader
 
 
 @pytest.fixture
@@ -73,3 +77,68 @@ def test_read_file_in_chunks():
     assert len(df) == 100
     assert df.iloc[0, 1] == "target_0_9674_2_-1"
     assert df.iloc[0, 3] == 9674
+
+
+def test_is_valid_tsv(std_pin):
+    """Test that PIN files with extra tabs are detected"""
+    with open(std_pin) as f_pin:
+        assert not pin_to_tsv.is_valid_tsv(f_pin)
+
+    valid = "specid\tlabel\tproteins\na\t1\tp1\nb\t-1\tp2\n"
+    assert pin_to_tsv.is_valid_tsv(StringIO(valid))
+    assert not pin_to_tsv.is_valid_tsv(StringIO(valid + "c\t1\tp1\tp2\n"))
+
+
+def test_parse_in_chunks(psms_ondisk):
+    """Test that training rows are read per fold with float32 features"""
+    train_idx = [[np.arange(0, 1000, 2)], [np.arange(1, 1000, 2)]]
+    folds = pin.parse_in_chunks(
+        [psms_ondisk], train_idx, chunk_size=300, max_workers=1
+    )
+    df = pd.read_csv(Path("data", "scope2_FP97AA.pin"), sep="\t")
+    for fold, (idx,) in zip(folds, train_idx):
+        np.testing.assert_array_equal(fold.index, idx)
+        np.testing.assert_array_equal(
+            fold["SpecId"].values, df["SpecId"].values[idx]
+        )
+        features = fold.loc[:, psms_ondisk.feature_columns]
+        assert (features.dtypes == np.float32).all()
+
+
+def test_drop_missing_values_and_fill_spectra_dataframe(tmp_path):
+    """Test that features with missing values are found in every chunk"""
+    df = pd.DataFrame(
+        {
+            "ScanNr": np.arange(10),
+            "Label": [1, -1] * 5,
+            "feat_a": np.arange(10.0),
+            "feat_b": [1.0] * 9 + [np.nan],
+            "feat_c": [np.nan] + [1.0] * 9,
+        }
+    )
+    df.to_csv(tmp_path / "missing.pin", sep="\t", index=False)
+    reader = TabularDataReader.from_path(tmp_path / "missing.pin")
+
+    spectra_list = []
+    with mock.patch.object(pin, "CHUNK_SIZE_ROWS_FOR_DROP_COLUMNS", 3):
+        dropped = pin.drop_missing_values_and_fill_spectra_dataframe(
+            reader=reader,
+            column=["feat_a", "feat_b", "feat_c", "ScanNr", "Label"],
+            spectra=["ScanNr", "Label"],
+            df_spectra_list=spectra_list,
+        )
+
+    assert dropped == ["feat_b", "feat_c"]
+    pd.testing.assert_frame_equal(
+        pd.concat(spectra_list), df.loc[:, ["ScanNr", "Label"]]
+    )
+
+    assert (
+        pin.drop_missing_values_and_fill_spectra_dataframe(
+            reader=reader,
+            column=["feat_a"],
+            spectra=["ScanNr", "Label"],
+            df_spectra_list=[],
+        )
+        is None
+    )
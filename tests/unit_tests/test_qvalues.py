@@ -6,7 +6,12 @@ import pytest
 import numpy as np
 from scipy import stats
 
-from mokapot.qvalues import tdc, qvalues_from_peps, qvalues_from_counts
+from mokapot.qvalues import (
+    tdc,
+    tdc_count_passing,
+    qvalues_from_peps,
+    qvalues_from_counts,
+)
 
 
 @pytest.fixture
@@ -114,6 +119,48 @@ def test_tdc_diff_len():
         tdc(scores, targets)
 
 
+def test_tdc_ties():
+    """Test that tied scores share the q-value of their group"""
+    scores = np.array([5, 5, 5, 4, 4, 3, 2, 2, 2, 1], dtype=float)
+    target = np.array([1, 0, 1, 1, 1, 0, 1, 0, 0, 1], dtype=bool)
+    true_qvals = np.array([1 / 2] * 5 + [3 / 4] + [5 / 6] * 4)
+    qvals = tdc(scores, target)
+    np.testing.assert_allclose(qvals, true_qvals, atol=1e-7)
+    qvals = tdc(-scores, target, desc=False)
+    np.testing.assert_allclose(qvals, true_qvals, atol=1e-7)
+    qvals = tdc(np.ones(10), target)
+    np.testing.assert_allclose(qvals, 5 / 6, atol=1e-7)
+
+
+def test_tdc_count_passing():
+    """Test that tdc_count_passing() counts the targets from tdc()"""
+    scores = np.array([5, 5, 5, 4, 4, 3, 2, 2, 2, 1], dtype=float)
+    target = np.array([1, 0, 1, 1, 1, 0, 1, 0, 0, 1], dtype=bool)
+    scores = np.column_stack([scores, -scores])
+    counts = tdc_count_passing(scores, target, 0.5)
+    np.testing.assert_array_equal(counts, [4, 0])
+    counts = tdc_count_passing(scores, target, 0.8, desc=False)
+    np.testing.assert_array_equal(counts, [0, 4])
+
+    rng = np.random.default_rng(42)
+    target = rng.integers(0, 2, 1000).astype(bool)
+    scores = np.column_stack(
+        [
+            rng.normal(size=1000) + target,
+            rng.integers(0, 10, 1000),  # Lots of ties
+            np.ones(1000),
+        ]
+    ).astype(np.float32)
+    for desc in (True, False):
+        for eval_fdr in (0.01, 0.1, 1.0):
+            expected = [
+                ((tdc(col, target, desc=desc) <= eval_fdr) & target).sum()
+                for col in scores.T
+            ]
+            counts = tdc_count_passing(scores, target, eval_fdr, desc=desc)
+            np.testing.assert_array_equal(counts, expected)
+
+
 @pytest.fixture
 def rand_scores():
     np.random.seed(1240)  # this produced an error with failing iterations